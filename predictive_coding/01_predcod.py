@@ -32,6 +32,10 @@ Example Usage:
     for value in sensor_input:
         errors = network.process_input(value)
 
+    # Or process a whole recorded signal in one pass; errors has shape
+    # (levels, len(sensor_input)), like network.err_history
+    errors = network.process_batch(sensor_input)
+
 References:
 ----------
 - Rao, R. P., & Ballard, D. H. (1999). Predictive coding in the visual cortex
@@ -42,6 +46,9 @@ References:
 import numpy as np
 from typing import List, Tuple
 import matplotlib.pyplot as plt
+from scipy.signal import lfilter
+
+from _pc_kernel import HAVE_CYTHON, HAVE_NUMBA, make_pc_kernel, pc_run, pc_sweep
 
 class PredictiveCodingNode:
     """
@@ -52,17 +59,55 @@ class PredictiveCodingNode:
     2. Computes prediction errors (difference between prediction and actual input)
     3. Updates its predictions to minimize these errors over time
     
+    The network stores the state of all its levels in flat arrays, so a node
+    is a lightweight view onto one level of a network. A node constructed on
+    its own owns a single-level network.
+    
     Attributes:
         prediction (float): Current prediction value of the node
         learning_rate (float): Rate at which predictions are updated based on errors
-        prediction_history (list): History of predictions for visualization
-        error_history (list): History of prediction errors for visualization
+        prediction_history (np.ndarray): History of predictions for visualization
+        error_history (np.ndarray): History of prediction errors for visualization
     """
-    def __init__(self, learning_rate: float = 0.1):
-        self.prediction = 0.0  # Current prediction
-        self.learning_rate = learning_rate
-        self.prediction_history = []
-        self.error_history = []
+    def __init__(self, learning_rate: float = 0.1, capacity: int = 1024):
+        self._network = PredictiveCodingNetwork(
+            num_nodes=1, learning_rates=[learning_rate], capacity=capacity
+        )
+        self._level = 0
+
+    @classmethod
+    def _view(cls, network: "PredictiveCodingNetwork", level: int) -> "PredictiveCodingNode":
+        """Create a node backed by one level of an existing network"""
+        node = cls.__new__(cls)
+        node._network = network
+        node._level = level
+        return node
+
+    @property
+    def prediction(self) -> float:
+        return float(self._network.predictions[self._level])
+
+    @prediction.setter
+    def prediction(self, value: float):
+        self._network.predictions[self._level] = value
+
+    @property
+    def learning_rate(self) -> float:
+        return float(self._network.learning_rates[self._level])
+
+    @learning_rate.setter
+    def learning_rate(self, value: float):
+        self._network.learning_rates[self._level] = value
+
+    @property
+    def prediction_history(self) -> np.ndarray:
+        """Predictions recorded so far (a view, not a copy)"""
+        return self._network.pred_history[self._level, :self._network._n]
+
+    @property
+    def error_history(self) -> np.ndarray:
+        """Prediction errors recorded so far (a view, not a copy)"""
+        return self._network.err_history[self._level, :self._network._n]
         
     def update(self, actual_value: float) -> Tuple[float, float]:
         """
@@ -71,6 +116,12 @@ class PredictiveCodingNode:
         Implements the core predictive coding update equation:
         prediction += learning_rate * prediction_error
         
+        A standalone node records every update in its history. A node of a
+        multi-level network updates only its own level's prediction; the
+        network's history holds whole timesteps, so such updates are not
+        recorded there (use the network's process_input to advance all
+        levels together).
+        
         Args:
             actual_value: The true value observed by this node
             
@@ -79,16 +130,12 @@ class PredictiveCodingNode:
             - prediction_error: Difference between prediction and actual value
             - prediction: Updated prediction after learning
         """
-        # Calculate prediction error (surprise signal)
+        if self._network.num_levels == 1:
+            prediction_error = self._network.process_input(actual_value)[0]
+            return prediction_error, self.prediction
+
         prediction_error = actual_value - self.prediction
-        
-        # Update prediction using prediction error (error minimization)
-        self.prediction += self.learning_rate * prediction_error
-        
-        # Store history for visualization
-        self.prediction_history.append(self.prediction)
-        self.error_history.append(prediction_error)
-        
+        self._network.predictions[self._level] += self.learning_rate * prediction_error
         return prediction_error, self.prediction
 
 class PredictiveCodingNetwork:
@@ -100,15 +147,70 @@ class PredictiveCodingNetwork:
     2. Error Propagation: Each level predicts errors from level below
     3. Multiple Timescales: Different learning rates at different levels
     
+    State is stored as a structure of arrays: one contiguous float64 array
+    per quantity, indexed by level, instead of one Python object per node.
+    
     Args:
         num_nodes: Number of hierarchical levels in the network
         learning_rates: Learning rate for each level (slower rates at higher levels)
+        capacity: Initial number of timesteps of history to preallocate
+        dtype: Floating point type of the state and history arrays. float32
+            halves memory traffic for long batched runs; pass np.float64 for
+            full precision.
+        
+    Attributes:
+        predictions (np.ndarray): Current prediction of each level
+        learning_rates (np.ndarray): Learning rate of each level
+        pred_history (np.ndarray): (levels, capacity) buffer of past predictions
+        err_history (np.ndarray): (levels, capacity) buffer of past errors
     """
-    def __init__(self, num_nodes: int = 3, learning_rates: List[float] = None):
+    def __init__(self, num_nodes: int = 3, learning_rates: List[float] = None,
+                 capacity: int = 1024, dtype: np.dtype = np.float32):
         if learning_rates is None:
             learning_rates = [0.1] * num_nodes
             
-        self.nodes = [PredictiveCodingNode(lr) for lr in learning_rates]
+        self.dtype = np.dtype(dtype)
+        self.learning_rates = np.array(learning_rates, dtype=self.dtype)
+        self.predictions = np.zeros(self.learning_rates.size, dtype=self.dtype)
+        self.pred_history = np.empty(
+            (self.learning_rates.size, max(capacity, 1)), dtype=self.dtype
+        )
+        self.err_history = np.empty_like(self.pred_history)
+        self._n = 0  # Number of timesteps recorded
+        self._errors = np.empty(self.learning_rates.size, dtype=self.dtype)
+        self._nodes = None
+        # Cached figure, axes and line handles for plot_predictions
+        self._fig = None
+        self._axes = None
+        self._lines = None
+        # Per-sample kernel unrolled for this network's depth
+        self._pc_step = make_pc_kernel(self.learning_rates.size)
+
+    @property
+    def num_levels(self) -> int:
+        return self.learning_rates.size
+
+    @property
+    def nodes(self) -> List[PredictiveCodingNode]:
+        """Per-level node views, kept for compatibility with node-based code"""
+        if self._nodes is None:
+            self._nodes = [
+                PredictiveCodingNode._view(self, level) for level in range(self.num_levels)
+            ]
+        return self._nodes
+
+    def _reserve(self, count: int):
+        """Grow the history buffers by doubling until `count` more steps fit"""
+        required = self._n + count
+        capacity = self.pred_history.shape[1]
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        for name in ("pred_history", "err_history"):
+            grown = np.empty((self.num_levels, capacity), dtype=self.dtype)
+            grown[:, :self._n] = getattr(self, name)[:, :self._n]
+            setattr(self, name, grown)
         
     def process_input(self, input_value: float) -> List[float]:
         """
@@ -126,34 +228,144 @@ class PredictiveCodingNetwork:
         Returns:
             List of prediction errors at each level
         """
-        current_signal = input_value
-        errors = []
-        
-        # Process up the hierarchy, with each level predicting the error below
-        for node in self.nodes:
-            error, prediction = node.update(current_signal)
-            errors.append(error)
-            # The error becomes the signal for the next level (error prediction)
-            current_signal = abs(error)  
-            
-        return errors
+        # Process up the hierarchy in one compiled call; each level predicts
+        # the error of the level below
+        self._pc_step(
+            self.predictions, self.learning_rates, float(input_value), self._errors
+        )
+
+        self._reserve(1)
+        self.pred_history[:, self._n] = self.predictions
+        self.err_history[:, self._n] = self._errors
+        self._n += 1
+
+        return self._errors.tolist()
+
+    def process_batch(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Process a whole signal through the hierarchy in one pass.
+
+        Results are identical to calling process_input once per sample. When
+        a compiled kernel is available (Numba, or the Cython build) the loop
+        over timesteps runs inside it. Otherwise each level's update,
+        prediction += learning_rate * prediction_error, is treated as the
+        linear recurrence p[t] = (1 - lr) * p[t-1] + lr * x[t], so the
+        predictions for all timesteps of a level come from a single IIR
+        filter instead of a Python loop over samples.
+
+        Args:
+            signal: 1-D array of sensory input values
+
+        Returns:
+            Array of shape (num_levels, len(signal)) holding the prediction
+            errors at each level, oriented like err_history
+        """
+        current = np.ascontiguousarray(signal, dtype=self.dtype)
+        count = current.size
+        if count == 0:
+            return np.empty((self.num_levels, 0), dtype=self.dtype)
+
+        self._reserve(count)
+        start, stop = self._n, self._n + count
+        preds = self.pred_history[:, start:stop]
+        errors = self.err_history[:, start:stop]
+
+        if HAVE_NUMBA or HAVE_CYTHON:
+            pc_run(self.predictions, self.learning_rates, current, preds, errors)
+        else:
+            for level in range(self.num_levels):
+                lr = self.learning_rates[level]
+                prior = self.predictions[level]
+                # Seed the filter with the level's current prediction so
+                # batches continue seamlessly from any earlier processing.
+                # Coefficients share the network dtype so lfilter does not
+                # upcast.
+                b = np.array([lr], dtype=self.dtype)
+                a = np.array([1.0, lr - 1.0], dtype=self.dtype)
+                preds[level], _ = lfilter(
+                    b, a, current, zi=np.array([(1.0 - lr) * prior], dtype=self.dtype)
+                )
+                # Errors are measured against the prediction made before each update
+                errors[level, 0] = current[0] - prior
+                np.subtract(current[1:], preds[level, :-1], out=errors[level, 1:])
+
+                # The error becomes the signal for the next level (error prediction)
+                current = np.abs(errors[level])
+            self.predictions[:] = preds[:, -1]
+
+        self._n = stop
+        return errors.copy()
     
     def plot_predictions(self):
-        """Plot prediction history for each node"""
-        fig, axes = plt.subplots(len(self.nodes), 1, figsize=(10, 3*len(self.nodes)))
-        if len(self.nodes) == 1:
+        """
+        Plot prediction history for each node.
+        
+        The figure is created on the first call and reused afterwards: later
+        calls only swap in the new line data and request a redraw, which keeps
+        repeated plotting of a live network cheap. A closed figure is
+        recreated on the next call.
+        """
+        steps = np.arange(self._n)
+        if self._fig is not None and plt.fignum_exists(self._fig.number):
+            for i, (pred_line, err_line) in enumerate(self._lines):
+                pred_line.set_data(steps, self.pred_history[i, :self._n])
+                err_line.set_data(steps, self.err_history[i, :self._n])
+                self._axes[i].relim()
+                self._axes[i].autoscale_view()
+            self._fig.canvas.draw_idle()
+            return self._fig
+
+        num_levels = self.num_levels
+        fig, axes = plt.subplots(num_levels, 1, figsize=(10, 3*num_levels))
+        if num_levels == 1:
             axes = [axes]
             
-        for i, node in enumerate(self.nodes):
-            axes[i].plot(node.prediction_history, label='Prediction')
-            axes[i].plot(node.error_history, label='Error', alpha=0.5)
+        lines = []
+        for i in range(num_levels):
+            pred_line, = axes[i].plot(
+                steps, self.pred_history[i, :self._n], label='Prediction'
+            )
+            err_line, = axes[i].plot(
+                steps, self.err_history[i, :self._n], label='Error', alpha=0.5
+            )
+            lines.append((pred_line, err_line))
             axes[i].set_title(f'Node {i+1}')
             axes[i].legend()
             axes[i].grid(True)
         
         plt.tight_layout()
+        self._fig, self._axes, self._lines = fig, axes, lines
         return fig
 
+def run_sweep(signals: np.ndarray, learning_rates: np.ndarray,
+              dtype: np.dtype = np.float32) -> np.ndarray:
+    """
+    Run many independent networks at once, e.g. for a parameter sweep.
+
+    Each row pairs one signal with one set of per-level learning rates and is
+    processed by a fresh network. With Numba installed the rows run in
+    parallel across CPU cores.
+
+    Args:
+        signals: (networks, timesteps) array of input signals
+        learning_rates: (networks, levels) array of learning rates
+        dtype: Floating point type of the computation
+
+    Returns:
+        Array of shape (networks, timesteps, levels) holding the prediction
+        errors of every network
+    """
+    signals = np.ascontiguousarray(signals, dtype=dtype)
+    learning_rates = np.ascontiguousarray(learning_rates, dtype=dtype)
+    if signals.ndim != 2 or learning_rates.ndim != 2:
+        raise ValueError("signals and learning_rates must both be 2-D arrays")
+    if signals.shape[0] != learning_rates.shape[0]:
+        raise ValueError("signals and learning_rates must have one row per network")
+
+    errors = np.empty(signals.shape + (learning_rates.shape[1],), dtype=dtype)
+    pc_sweep(signals, learning_rates, errors)
+    return errors
+
 # Example usage
 def generate_pattern(n_steps: int = 100) -> np.ndarray:
     """
@@ -191,10 +403,7 @@ def demo_predictive_coding():
     )
     
     # Process signal
-    errors = []
-    for value in signal:
-        level_errors = network.process_input(value)
-        errors.append(level_errors)
+    errors = network.process_batch(signal)
     
     # Plot results
     network.plot_predictions()
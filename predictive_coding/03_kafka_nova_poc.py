@@ -26,7 +26,8 @@ Requirements:
 ------------
 - Docker containers for Kafka and Zookeeper
 - confluent-kafka-python client
-- Python 3.12+ for async/await support
+- orjson for message serialization
+- Python 3.11+ (asyncio.TaskGroup)
 
 Docker Setup:
 ------------
@@ -51,232 +52,91 @@ docker run -d --name kafka \
     confluentinc/cp-kafka:latest
 """
 
-from confluent_kafka import Producer, Consumer
-import json
+from confluent_kafka import Producer
+from _nova_kafka import PRODUCER_DEFAULTS, NOVALayer, timed_process
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, NamedTuple, Optional
 import asyncio
 import logging
+import os
 
 
 logger = logging.getLogger(__name__)
 
+# The layers do no real work in this POC; set NOVA_SIMULATE=1 to add the
+# artificial per-layer processing delays
+SIMULATE_LATENCY = os.environ.get("NOVA_SIMULATE", "0") == "1"
 
-class KafkaPublishError(Exception):
-    """Raised when there is an error publishing messages to Kafka"""
 
-    pass
 
 
-class NOVALayerError(Exception):
-    """Base exception for NOVA layer errors"""
+class LayerSpec(NamedTuple):
+    """What sets one POC layer apart from the others"""
 
-    pass
+    name: str
+    latency: float  # Simulated processing time in seconds
+    type: str  # "type" field of the layer's results
+    text_field: str  # Result field that echoes the input content
+    text_prefix: str
+    extra: Dict[str, Any]  # Constant fields added to every result
+    durable: bool  # Publish with acks=all instead of fire-and-forget
 
 
-def timed_process(func):
-    """Decorator to add timing information to layer processing"""
+LAYER_SPECS = (
+    # Fast response layer: immediate responses with minimal processing
+    LayerSpec("reactive", 0.05, "reactive_response",
+              "content", "Quick acknowledgment: ", {}, False),
+    # Context-aware layer: awareness of immediate context
+    LayerSpec("responsive", 0.2, "responsive_response",
+              "content", "Thoughtful response to: ", {"context": "user_interaction"}, False),
+    # Learning and adaptation layer: pattern learning, long-term adaptation
+    LayerSpec("reflective", 0.4, "reflective_update",
+              "learning", "Learned from: ", {"pattern": "user_interaction_pattern"}, True),
+)
 
-    async def wrapper(self, message: Dict[str, Any], *args, **kwargs) -> Dict[str, Any]:
-        start_time = time.time()
-        try:
-            result = await func(self, message, *args, **kwargs)
-            end_time = time.time()
 
-            # If result is already a dict, update it; otherwise create new dict
-            if isinstance(result, dict):
-                result.update(
-                    {
-                        "start_time": start_time,
-                        "end_time": end_time,
-                        "processing_duration": end_time - start_time,
-                    }
-                )
-                return result
-            else:
-                return {
-                    "result": result,
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "processing_duration": end_time - start_time,
-                }
-        except Exception as e:
-            logger.error(
-                "Layer processing failed",
-                extra={"layer": self.__class__.__name__, "error": str(e)},
-                exc_info=True,
-            )
-            raise NOVALayerError(f"Layer processing failed: {e}") from e
-
-    return wrapper
-
-
-class NOVALayer:
+class Layer(NOVALayer):
     """
-    Base class for NOVA processing layers.
+    POC processing layer described by a LayerSpec.
 
-    Handles Kafka producer/consumer setup and message publishing.
-    Each layer inherits from this to implement specific processing logic.
+    The layers of this POC only differ in their simulated latency and the
+    shape of their result, so one class serves all of them; adding a layer
+    means adding a row to LAYER_SPECS.
 
     Args:
         kafka_config (Dict[str, Any]): Kafka configuration parameters
+        spec (LayerSpec): The layer's latency and result shape
+        producer (Optional[Producer]): Shared producer to publish through;
+            durable layers should be given None so they own an acks=all one
     """
 
-    def __init__(self, kafka_config: Dict[str, Any]):
-        # Producer config should exclude consumer-specific settings
-        producer_config = {"bootstrap.servers": kafka_config["bootstrap.servers"]}
-
-        # Consumer config can keep all settings
-        consumer_config = kafka_config.copy()
-
-        self.producer = Producer(producer_config)
-        self.consumer = Consumer(consumer_config)
-
-    def close(self):
-        """
-        Properly close Kafka resources.
-        Should be called when the layer is no longer needed.
-        """
-        if self.producer:
-            self.producer.flush()  # Ensure all messages are sent
+    def __init__(self, kafka_config: Dict[str, Any], spec: LayerSpec,
+                 producer: Optional[Producer] = None):
+        self.spec = spec
+        super().__init__(kafka_config, producer, fast_mode=not spec.durable)
 
-        if self.consumer:
-            self.consumer.close()
-
-    def __del__(self):
-        """Ensure resources are cleaned up when object is garbage collected"""
-        try:
-            self.close()
-        except:
-            # Ignore errors during cleanup in destructor
-            pass
-
-    def publish(self, topic: str, message: Dict[str, Any]):
-        """
-        Non-blocking publish to Kafka topic
-        """
-        try:
-            self.producer.produce(
-                topic,
-                json.dumps(message).encode("utf-8"),
-                callback=self.delivery_report,
-            )
-            self.producer.poll(0)  # Non-blocking poll for callbacks
-        except Exception as e:
-            logger.error(
-                "Failed to publish message to Kafka",
-                extra={
-                    "topic": topic,
-                    "error": str(e),
-                    "layer": self.__class__.__name__,
-                },
-                exc_info=True,
-            )
-            raise KafkaPublishError(f"Failed to publish message to Kafka: {e}") from e
-
-    def delivery_report(self, err, msg):
-        """Callback for Kafka message delivery confirmation"""
-        if err is not None:
-            logger.error(
-                "Message delivery failed",
-                extra={
-                    "topic": msg.topic(),
-                    "error": str(err),
-                    "layer": self.__class__.__name__,
-                },
-            )
-            # Note: Can't raise here as it's a callback
-            # Consider implementing a message retry mechanism
-        else:
-            logger.debug(
-                "Message delivered successfully",
-                extra={"topic": msg.topic(), "layer": self.__class__.__name__},
-            )
-
-
-class ReactiveLayer(NOVALayer):
-    """
-    Fast response layer (50-100ms)
-
-    Handles immediate responses with minimal processing.
-    - Fastest response time
-    - Minimal context consideration
-    - Basic pattern matching
-    """
+    @property
+    def name(self) -> str:
+        return self.spec.name
 
     @timed_process
     async def process(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Quick processing of immediate responses
+        Process a message according to the layer's spec
 
         Args:
             message (Dict[str, Any]): Input message to process
 
         Returns:
-            Dict[str, Any]: Processed response
+            Dict[str, Any]: The layer's response
         """
-        await asyncio.sleep(0.05)  # 50ms for immediate response
+        spec = self.spec
+        if SIMULATE_LATENCY:
+            await asyncio.sleep(spec.latency)
         return {
-            "type": "reactive_response",
-            "content": f"Quick acknowledgment: {message.get('content', '')}",
-        }
-
-
-class ResponsiveLayer(NOVALayer):
-    """
-    Context-aware layer (100-300ms)
-
-    Processes information with awareness of immediate context.
-    - Medium response time
-    - Context integration
-    - Short-term pattern recognition
-    """
-
-    @timed_process
-    async def process(self, message: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Process with context awareness
-
-        Args:
-            message (Dict[str, Any]): Input message to process
-
-        Returns:
-            Dict[str, Any]: Context-aware response
-        """
-        await asyncio.sleep(0.2)  # 200ms for context processing
-        return {
-            "type": "responsive_response",
-            "content": f"Thoughtful response to: {message.get('content', '')}",
-            "context": "user_interaction",
-        }
-
-
-class ReflectiveLayer(NOVALayer):
-    """
-    Learning and adaptation layer (300-500ms)
-
-    Handles pattern learning and long-term adaptation.
-    - Pattern analysis
-    - Learning and adaptation
-    - Long-term memory integration
-    """
-
-    @timed_process
-    async def process(self, message: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Process for long-term learning and adaptation
-
-        Args:
-            message (Dict[str, Any]): Input message to process
-
-        Returns:
-            Dict[str, Any]: Learning/adaptation response
-        """
-        await asyncio.sleep(0.4)  # 400ms for learning/adaptation
-        return {
-            "type": "reflective_update",
-            "pattern": "user_interaction_pattern",
-            "learning": f"Learned from: {message.get('content', '')}",
+            "type": spec.type,
+            **spec.extra,
+            spec.text_field: spec.text_prefix + message.get("content", ""),
         }
 
 
@@ -289,47 +149,83 @@ class NOVA:
     """
 
     def __init__(self, kafka_config: Dict[str, Any]):
-        self.reactive = ReactiveLayer(kafka_config)
-        self.responsive = ResponsiveLayer(kafka_config)
-        self.reflective = ReflectiveLayer(kafka_config)
+        # One producer for the fire-and-forget layers: topics are chosen per
+        # message, and a shared producer batches (and compresses) across
+        # layers. It is only flushed on close; publishing never waits for
+        # broker acks. Durable layers (the reflective layer's learned
+        # patterns should survive a broker hiccup) publish through their own
+        # acks=all producer.
+        self.producer = Producer(
+            {"bootstrap.servers": kafka_config["bootstrap.servers"], **PRODUCER_DEFAULTS}
+        )
+        self.layers = {
+            spec.name: Layer(kafka_config, spec, None if spec.durable else self.producer)
+            for spec in LAYER_SPECS
+        }
+
+    async def run(self, input_topic: str = "nova.input"):
+        """
+        Run all layers as concurrent consumers of input_topic until
+        cancelled; each publishes its results to nova.<layer>.output.
+
+        If one layer's loop fails the others are cancelled, rather than
+        left consuming without it.
+        """
+        async with asyncio.TaskGroup() as tg:
+            for name, layer in self.layers.items():
+                tg.create_task(layer.process_loop(input_topic, f"nova.{name}.output"))
 
     async def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Process message through all layers in parallel"""
-        logger.info("Starting parallel processing", extra={"timestamp": time.time()})
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Starting parallel processing", extra={"timestamp": time.time()})
 
-        tasks = {
-            "reactive": self.reactive.process(message),
-            "responsive": self.responsive.process(message),
-            "reflective": self.reflective.process(message),
-        }
+        tasks = {name: layer.process(message) for name, layer in self.layers.items()}
+
+        # Run the layers concurrently; a failing layer doesn't cancel the others
+        outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
 
         results = {}
-        for name, task in tasks.items():
-            try:
-                results[name] = await task
-            except Exception as e:
-                logger.error(f"Error in {name} layer", exc_info=True)
+        for name, outcome in zip(tasks, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error in {name} layer", exc_info=outcome)
                 results[name] = None
+            else:
+                results[name] = outcome
 
-        # Flush producers after all processing
-        try:
-            for layer in (self.reactive, self.responsive, self.reflective):
-                layer.producer.flush()
-        except Exception as e:
-            logger.error("Failed to flush producers", exc_info=True)
-            raise KafkaPublishError("Failed to flush Kafka producers") from e
-
-        logger.info("All processing completed", extra={"timestamp": time.time()})
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("All processing completed", extra={"timestamp": time.time()})
         return results
 
+    async def process_batch(self, messages: List[Dict[str, Any]],
+                            concurrency: int = 64) -> List[Dict[str, Any]]:
+        """
+        Process many messages concurrently, in input order.
+
+        At most `concurrency` messages are in flight at once, so a batch
+        takes roughly len(messages) / concurrency times the slowest layer
+        instead of the sum over all messages.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(message: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_message(message)
+
+        return await asyncio.gather(*(bounded(m) for m in messages))
+
     def close(self):
         """Clean up resources for all layers"""
-        self.reactive.close()
-        self.responsive.close()
-        self.reflective.close()
+        # Flush the shared producer first so the layers can report any
+        # delivery failures it surfaces
+        self.producer.flush()
+        for layer in self.layers.values():
+            layer.close()
 
-    def __del__(self):
-        """Ensure all resources are cleaned up"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
         self.close()
 
 
@@ -340,35 +236,37 @@ async def main():
     Sets up Kafka configuration and processes a test message
     through all layers.
     """
-    try:
-        # Kafka configuration
-        kafka_config = {
-            "bootstrap.servers": "localhost:9092",
-            "group.id": "nova_group",
-            "auto.offset.reset": "earliest",
-        }
-
-        # Initialize NOVA
-        nova = NOVA(kafka_config)
-
-        # Example message
-        message = {
-            "type": "user_input",
-            "content": "Hello, how are you?",
-            "timestamp": time.time(),
-        }
-
-        # Process message
-        results = await nova.process_message(message)
-        print("\nProcessing Results:")
-        print("Reactive:\n", results["reactive"])
-        print("Responsive:\n", results["responsive"])
-        print("Reflective:\n", results["reflective"])
-
-    finally:
-        # Ensure resources are properly cleaned up
-        nova.close()
+    # Kafka configuration
+    kafka_config = {
+        "bootstrap.servers": "localhost:9092",
+        "group.id": "nova_group",
+        "auto.offset.reset": "earliest",
+    }
+
+    # Initialize NOVA; resources are cleaned up when the block exits
+    with NOVA(kafka_config) as nova:
+        # Example messages
+        messages = [
+            {
+                "type": "user_input",
+                "content": content,
+                "timestamp": time.time(),
+            }
+            for content in ("Hello, how are you?", "What's new today?")
+        ]
+
+        # Process the messages concurrently
+        for results in await nova.process_batch(messages):
+            print("\nProcessing Results:")
+            print("Reactive:\n", results["reactive"])
+            print("Responsive:\n", results["responsive"])
+            print("Reflective:\n", results["reflective"])
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # Optional libuv-based event loop; faster task and timer dispatch
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
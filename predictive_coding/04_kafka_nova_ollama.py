@@ -26,7 +26,8 @@ Requirements:
 ------------
 - Docker containers for Kafka and Zookeeper
 - confluent-kafka-python client
-- Python 3.12+ for async/await support
+- orjson for message serialization
+- Python 3.11+ (asyncio.TaskGroup)
 
 Docker Setup:
 ------------
@@ -51,8 +52,8 @@ docker run -d --name kafka \
     confluentinc/cp-kafka:latest
 """
 
-from confluent_kafka import Producer, Consumer
-import json
+from confluent_kafka import Producer
+from _nova_kafka import PRODUCER_DEFAULTS, NOVALayer, NOVALayerError, timed_process
 import time
 from typing import Dict, Any, Optional
 import asyncio
@@ -66,136 +67,6 @@ logger = logging.getLogger(__name__)
 MODEL_NAME = 'llama3.2:latest'
 
 
-class KafkaPublishError(Exception):
-    """Raised when there is an error publishing messages to Kafka"""
-
-    pass
-
-
-class NOVALayerError(Exception):
-    """Base exception for NOVA layer errors"""
-
-    pass
-
-
-def timed_process(func):
-    """Decorator to add timing information to layer processing"""
-
-    async def wrapper(self, message: Dict[str, Any], *args, **kwargs) -> Dict[str, Any]:
-        start_time = time.time()
-        try:
-            result = await func(self, message, *args, **kwargs)
-            end_time = time.time()
-
-            # If result is already a dict, update it; otherwise create new dict
-            if isinstance(result, dict):
-                result.update(
-                    {
-                        "start_time": start_time,
-                        "end_time": end_time,
-                        "processing_duration": end_time - start_time,
-                    }
-                )
-                return result
-            else:
-                return {
-                    "result": result,
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "processing_duration": end_time - start_time,
-                }
-        except Exception as e:
-            logger.error(
-                "Layer processing failed",
-                extra={"layer": self.__class__.__name__, "error": str(e)},
-                exc_info=True,
-            )
-            raise NOVALayerError(f"Layer processing failed: {e}") from e
-
-    return wrapper
-
-
-class NOVALayer:
-    """
-    Base class for NOVA processing layers.
-
-    Handles Kafka producer/consumer setup and message publishing.
-    Each layer inherits from this to implement specific processing logic.
-
-    Args:
-        kafka_config (Dict[str, Any]): Kafka configuration parameters
-    """
-
-    def __init__(self, kafka_config: Dict[str, Any]):
-        # Producer config should exclude consumer-specific settings
-        producer_config = {"bootstrap.servers": kafka_config["bootstrap.servers"]}
-
-        # Consumer config can keep all settings
-        consumer_config = kafka_config.copy()
-
-        self.producer = Producer(producer_config)
-        self.consumer = Consumer(consumer_config)
-
-    def close(self):
-        """
-        Properly close Kafka resources.
-        Should be called when the layer is no longer needed.
-        """
-        if self.producer:
-            self.producer.flush()  # Ensure all messages are sent
-
-        if self.consumer:
-            self.consumer.close()
-
-    def __del__(self):
-        """Ensure resources are cleaned up when object is garbage collected"""
-        try:
-            self.close()
-        except:
-            # Ignore errors during cleanup in destructor
-            pass
-
-    def publish(self, topic: str, message: Dict[str, Any]):
-        """
-        Non-blocking publish to Kafka topic
-        """
-        try:
-            self.producer.produce(
-                topic,
-                json.dumps(message).encode("utf-8"),
-                callback=self.delivery_report,
-            )
-            self.producer.poll(0)  # Non-blocking poll for callbacks
-        except Exception as e:
-            logger.error(
-                "Failed to publish message to Kafka",
-                extra={
-                    "topic": topic,
-                    "error": str(e),
-                    "layer": self.__class__.__name__,
-                },
-                exc_info=True,
-            )
-            raise KafkaPublishError(f"Failed to publish message to Kafka: {e}") from e
-
-    def delivery_report(self, err, msg):
-        """Callback for Kafka message delivery confirmation"""
-        if err is not None:
-            logger.error(
-                "Message delivery failed",
-                extra={
-                    "topic": msg.topic(),
-                    "error": str(err),
-                    "layer": self.__class__.__name__,
-                },
-            )
-            # Note: Can't raise here as it's a callback
-            # Consider implementing a message retry mechanism
-        else:
-            logger.debug(
-                "Message delivered successfully",
-                extra={"topic": msg.topic(), "layer": self.__class__.__name__},
-            )
 
 
 class ReactiveLayer(NOVALayer):
@@ -208,8 +79,9 @@ class ReactiveLayer(NOVALayer):
     - Basic pattern matching
     """
 
-    def __init__(self, kafka_config: Dict[str, Any]):
-        super().__init__(kafka_config)
+    def __init__(self, kafka_config: Dict[str, Any], producer: Optional[Producer] = None,
+                 fast_mode: bool = True):
+        super().__init__(kafka_config, producer, fast_mode)
         self.ollama = OllamaClient()
         self.system_prompt = """You are a reactive processor that gives IMMEDIATE, VERY SHORT responses.
         Rules:
@@ -256,8 +128,9 @@ class ResponsiveLayer(NOVALayer):
     - Short-term pattern recognition
     """
 
-    def __init__(self, kafka_config: Dict[str, Any]):
-        super().__init__(kafka_config)
+    def __init__(self, kafka_config: Dict[str, Any], producer: Optional[Producer] = None,
+                 fast_mode: bool = True):
+        super().__init__(kafka_config, producer, fast_mode)
         self.ollama = OllamaClient()
         self.system_prompt = """You are a responsive processor that considers immediate 
         context and gives thoughtful, measured responses. Balance between quick response 
@@ -306,8 +179,9 @@ class ReflectiveLayer(NOVALayer):
     - Long-term memory integration
     """
 
-    def __init__(self, kafka_config: Dict[str, Any]):
-        super().__init__(kafka_config)
+    def __init__(self, kafka_config: Dict[str, Any], producer: Optional[Producer] = None,
+                 fast_mode: bool = True):
+        super().__init__(kafka_config, producer, fast_mode)
         self.ollama = OllamaClient()
         self.system_prompt = """You are a reflective processor focused on deep analysis, 
         pattern recognition, and learning. Consider long-term implications and generate insights."""
@@ -358,13 +232,35 @@ class NOVA:
     """
 
     def __init__(self, kafka_config: Dict[str, Any]):
-        self.reactive = ReactiveLayer(kafka_config)
-        self.responsive = ResponsiveLayer(kafka_config)
-        self.reflective = ReflectiveLayer(kafka_config)
+        # One producer for the reactive and responsive layers: topics are
+        # chosen per message, and a shared producer batches (and compresses)
+        # across layers. It is only flushed on close; publishing never waits
+        # for broker acks. Learned patterns should survive a broker hiccup,
+        # so the reflective layer publishes through its own acks=all producer.
+        self.producer = Producer(
+            {"bootstrap.servers": kafka_config["bootstrap.servers"], **PRODUCER_DEFAULTS}
+        )
+        self.reactive = ReactiveLayer(kafka_config, self.producer)
+        self.responsive = ResponsiveLayer(kafka_config, self.producer)
+        self.reflective = ReflectiveLayer(kafka_config, fast_mode=False)
+
+    async def run(self, input_topic: str = "nova.input"):
+        """
+        Run all three layers as concurrent consumers of input_topic until
+        cancelled; each publishes its results to nova.<layer>.output.
+
+        If one layer's loop fails the others are cancelled, rather than
+        left consuming without it.
+        """
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self.reactive.process_loop(input_topic, "nova.reactive.output"))
+            tg.create_task(self.responsive.process_loop(input_topic, "nova.responsive.output"))
+            tg.create_task(self.reflective.process_loop(input_topic, "nova.reflective.output"))
 
     async def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Process message through all layers in parallel"""
-        logger.info("Starting parallel processing", extra={"timestamp": time.time()})
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Starting parallel processing", extra={"timestamp": time.time()})
 
         tasks = {
             "reactive": self.reactive.process(message),
@@ -372,32 +268,34 @@ class NOVA:
             "reflective": self.reflective.process(message),
         }
 
-        results = {}
-        for name, task in tasks.items():
-            try:
-                results[name] = await task
-            except Exception as e:
-                logger.error(f"Error in {name} layer", exc_info=True)
-                results[name] = {"type": f"{name}_error", "content": str(e)}
+        # Run the layers concurrently; a failing layer doesn't cancel the others
+        outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
 
-        try:
-            for layer in (self.reactive, self.responsive, self.reflective):
-                layer.producer.flush()
-        except Exception as e:
-            logger.error("Failed to flush producers", exc_info=True)
-            raise
+        results = {}
+        for name, outcome in zip(tasks, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error in {name} layer", exc_info=outcome)
+                results[name] = {"type": f"{name}_error", "content": str(outcome)}
+            else:
+                results[name] = outcome
 
-        logger.info("All processing completed", extra={"timestamp": time.time()})
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("All processing completed", extra={"timestamp": time.time()})
         return results
 
     async def close(self):
         """Clean up resources for all layers"""
+        # Flush the shared producer first so the layers can report any
+        # delivery failures it surfaces
+        self.producer.flush()
         for layer in (self.reactive, self.responsive, self.reflective):
             layer.close()
 
-    def __del__(self):
-        """Ensure all resources are cleaned up"""
-        asyncio.create_task(self.close())
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
 
 
 async def main():
@@ -409,17 +307,15 @@ async def main():
     - Responsive: Context-aware processing
     - Reflective: Deep thinking and pattern analysis
     """
-    try:
-        # Kafka configuration
-        kafka_config = {
-            "bootstrap.servers": "localhost:9092",
-            "group.id": "nova_group",
-            "auto.offset.reset": "earliest",
-        }
-
-        # Initialize NOVA
-        nova = NOVA(kafka_config)
-
+    # Kafka configuration
+    kafka_config = {
+        "bootstrap.servers": "localhost:9092",
+        "group.id": "nova_group",
+        "auto.offset.reset": "earliest",
+    }
+
+    # Initialize NOVA; resources are cleaned up when the block exits
+    async with NOVA(kafka_config) as nova:
         # Process a sequence of messages to demonstrate different aspects
         messages = [
             {
@@ -471,10 +367,11 @@ async def main():
             print("\n" + "="*80)
             await asyncio.sleep(1)  # Pause between messages
 
-    finally:
-        # Ensure resources are properly cleaned up
-        await nova.close()
-
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # Optional libuv-based event loop; faster task and timer dispatch
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
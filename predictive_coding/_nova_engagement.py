@@ -0,0 +1,82 @@
+"""
+Interaction states and the engagement rules that pick between them.
+
+02_predcod_nova.py classifies engagement one window at a time and, for
+batches, with numpy; _nova_jax.py classifies inside a traced step. All of
+them read the states, their integer codes and the thresholds from here, so
+the implementations cannot drift apart. Nothing in this module imports
+numpy or jax.
+"""
+
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class InteractionState(Enum):
+    BUILDING_RAPPORT = "building_rapport"
+    MAINTAINING_ENGAGEMENT = "maintaining_engagement"
+    RECOVERING_ATTENTION = "recovering_attention"
+    DEEPENING_INTERACTION = "deepening_interaction"
+    EMOTIONAL_TRANSITION = "emotional_transition"  # New state for handling emotional shifts
+    RECALIBRATING = "recalibrating"  # New state for handling uncertainty
+    FLOW_STATE = "flow_state"  # New state for optimal engagement
+
+# Stable integer code for each state, used by the vectorized classifiers
+INTERACTION_STATES: Tuple[InteractionState, ...] = tuple(InteractionState)
+STATE_CODES: Dict[InteractionState, int] = {
+    state: code for code, state in enumerate(INTERACTION_STATES)
+}
+
+
+class EngagementRule(NamedTuple):
+    """A state and exclusive bounds on the window statistics; None leaves a bound open"""
+    state: InteractionState
+    min_abs_momentum: Optional[float] = None
+    min_trend: Optional[float] = None
+    max_trend: Optional[float] = None
+    max_abs_trend: Optional[float] = None
+    min_volatility: Optional[float] = None
+    max_volatility: Optional[float] = None
+
+
+# Checked in order: the first rule whose bounds all hold gives the state
+ENGAGEMENT_RULES: Tuple[EngagementRule, ...] = (
+    # Rapid emotional shifts
+    EngagementRule(InteractionState.EMOTIONAL_TRANSITION, min_abs_momentum=0.5),
+    # Optimal engagement (flow state)
+    EngagementRule(InteractionState.FLOW_STATE, min_trend=0.6, max_volatility=0.2),
+    # Uncertainty and volatility
+    EngagementRule(InteractionState.RECALIBRATING, min_volatility=0.4, max_abs_trend=0.2),
+    EngagementRule(InteractionState.RECOVERING_ATTENTION, min_volatility=0.4),
+    # Standard state transitions
+    EngagementRule(InteractionState.DEEPENING_INTERACTION, min_trend=0.3, max_volatility=0.3),
+    EngagementRule(InteractionState.RECOVERING_ATTENTION, max_trend=-0.2),
+)
+# State of a window that matches no rule
+DEFAULT_ENGAGEMENT = InteractionState.MAINTAINING_ENGAGEMENT
+
+
+def engagement_conditions(trend: Any, momentum: Any, volatility: Any) -> List[Any]:
+    """
+    Evaluate each of ENGAGEMENT_RULES on the window statistics.
+
+    Only comparisons, abs() and & are used, so this works elementwise on
+    floats, numpy arrays and traced jax arrays alike, and the result can be
+    passed straight to np.select or jnp.select.
+    """
+    abs_momentum, abs_trend = abs(momentum), abs(trend)
+    conditions = []
+    for rule in ENGAGEMENT_RULES:
+        met = True
+        for value, lower, upper in (
+            (abs_momentum, rule.min_abs_momentum, None),
+            (trend, rule.min_trend, rule.max_trend),
+            (abs_trend, None, rule.max_abs_trend),
+            (volatility, rule.min_volatility, rule.max_volatility),
+        ):
+            if lower is not None:
+                met = met & (value > lower)
+            if upper is not None:
+                met = met & (value < upper)
+        conditions.append(met)
+    return conditions
@@ -0,0 +1,166 @@
+"""
+JAX implementation of the NOVA numeric forward pass.
+
+The numeric part of one interaction in 02_predcod_nova.py (reactive emotion
+update, responsive context window and engagement classification, reflective
+error statistics) is a pure function of (state, signal value). Expressed over
+a fixed-shape state pytree it can be compiled with jax.jit into a single XLA
+kernel and batched with jax.vmap, so one call advances thousands of
+independent users on CPU, GPU or TPU.
+
+Everything that cannot be traced (simulated sleeps, choosing a response
+string, building result dicts) stays outside the compiled step. The integer
+state codes returned here index INTERACTION_STATES in _nova_engagement, and
+the engagement thresholds come from its ENGAGEMENT_RULES.
+
+Example Usage:
+-------------
+    state = init_batch_state(num_users=4096)
+    state, outputs = step_batch(state, signal_values)
+"""
+
+from typing import NamedTuple, Tuple
+
+import jax
+import jax.numpy as jnp
+
+from _nova_engagement import (
+    DEFAULT_ENGAGEMENT,
+    ENGAGEMENT_RULES,
+    STATE_CODES,
+    InteractionState,
+    engagement_conditions,
+)
+
+BUILDING_RAPPORT = STATE_CODES[InteractionState.BUILDING_RAPPORT]
+
+
+class NovaState(NamedTuple):
+    """Per-user state; ring buffers keep the newest value in the last slot"""
+    emotion: jnp.ndarray
+    recent_errors: jnp.ndarray  # (memory_size,) reactive error history
+    context: jnp.ndarray  # (context_window_size,) recent signal values
+    reflective_errors: jnp.ndarray  # (min_samples,) reflective error window
+    count: jnp.ndarray  # Number of interactions processed
+
+
+class NovaOutputs(NamedTuple):
+    emotion: jnp.ndarray
+    prediction_error: jnp.ndarray
+    learning_rate: jnp.ndarray
+    predicted_next: jnp.ndarray
+    state_code: jnp.ndarray
+    context_confidence: jnp.ndarray
+    confidence: jnp.ndarray
+    stable: jnp.ndarray
+
+
+def init_state(memory_size: int = 5, context_window_size: int = 10,
+               min_samples: int = 5) -> NovaState:
+    """Create the state of a single fresh VirtualHuman"""
+    return NovaState(
+        emotion=jnp.zeros(()),
+        recent_errors=jnp.zeros(memory_size),
+        context=jnp.zeros(context_window_size),
+        reflective_errors=jnp.zeros(min_samples),
+        count=jnp.zeros((), dtype=jnp.int32),
+    )
+
+
+def init_batch_state(num_users: int, **sizes: int) -> NovaState:
+    """Create stacked state for `num_users` independent VirtualHumans"""
+    single = init_state(**sizes)
+    return jax.tree_util.tree_map(
+        lambda leaf: jnp.broadcast_to(leaf, (num_users,) + leaf.shape), single
+    )
+
+
+def _push(buffer: jnp.ndarray, value: jnp.ndarray) -> jnp.ndarray:
+    """Append to a fixed-size ring buffer, dropping the oldest value"""
+    return jnp.roll(buffer, -1).at[-1].set(value)
+
+
+def _masked_mean_std(buffer: jnp.ndarray,
+                     filled: jnp.ndarray) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Population mean and std over the `filled` newest slots of a ring buffer"""
+    size = buffer.shape[0]
+    n = jnp.clip(filled, 1, size)
+    mask = jnp.arange(size) >= size - n
+    mean = jnp.sum(jnp.where(mask, buffer, 0.0)) / n
+    var = jnp.sum(jnp.where(mask, (buffer - mean) ** 2, 0.0)) / n
+    return mean, jnp.sqrt(var)
+
+
+def _classify(trend: jnp.ndarray, momentum: jnp.ndarray,
+              volatility: jnp.ndarray) -> jnp.ndarray:
+    """Traceable counterpart of classify_engagement, returning a state code"""
+    return jnp.select(
+        engagement_conditions(trend, momentum, volatility),
+        [STATE_CODES[rule.state] for rule in ENGAGEMENT_RULES],
+        default=STATE_CODES[DEFAULT_ENGAGEMENT],
+    )
+
+
+@jax.jit
+def step(state: NovaState, value: jnp.ndarray, base_learning_rate: float = 0.3,
+         volatility_threshold: float = 0.3) -> Tuple[NovaState, NovaOutputs]:
+    """
+    Advance one VirtualHuman by one interaction.
+
+    Args:
+        state: The user's current state
+        value: The incoming emotional signal value in [-1, 1]
+        base_learning_rate: Reactive layer base learning rate
+        volatility_threshold: Reflective layer stability threshold
+
+    Returns:
+        Tuple of the updated state and the numeric outputs of all three layers
+    """
+    count = state.count + 1
+
+    # Reactive: adaptive-rate update towards the observed emotion
+    prediction_error = value - state.emotion
+    recent_errors = _push(state.recent_errors, prediction_error)
+    _, error_volatility = _masked_mean_std(recent_errors, count)
+    learning_rate = base_learning_rate * (1 + error_volatility)
+    emotion = jnp.clip(state.emotion + learning_rate * prediction_error, -1.0, 1.0)
+
+    # Responsive: context mean and engagement state from the last three values
+    context = _push(state.context, value)
+    window_size = context.shape[0]
+    context_pattern, _ = _masked_mean_std(context, count)
+    predicted_next = context_pattern * 0.8 + emotion * 0.2
+    first, middle, last = context[-3], context[-2], context[-1]
+    momentum = 0.7 * 0.3 * (middle - first) + 0.3 * (last - middle)
+    trend = (first + middle + last) / 3
+    recent_volatility = jnp.sqrt(
+        ((first - trend) ** 2 + (middle - trend) ** 2 + (last - trend) ** 2) / 3
+    )
+    state_code = jnp.where(
+        count < 3, BUILDING_RAPPORT, _classify(trend, momentum, recent_volatility)
+    )
+    context_confidence = jnp.minimum(count, window_size) / window_size
+
+    # Reflective: stability of the recent prediction errors
+    reflective_errors = _push(state.reflective_errors, prediction_error)
+    min_samples = reflective_errors.shape[0]
+    _, volatility = _masked_mean_std(reflective_errors, count)
+    warmed_up = count >= min_samples
+    confidence = jnp.where(warmed_up, jnp.maximum(0.0, 1 - volatility), 0.0)
+    stable = warmed_up & (volatility < volatility_threshold)
+
+    new_state = NovaState(emotion, recent_errors, context, reflective_errors, count)
+    outputs = NovaOutputs(
+        emotion, prediction_error, learning_rate, predicted_next, state_code,
+        context_confidence, confidence, stable,
+    )
+    return new_state, outputs
+
+
+@jax.jit
+def step_batch(state: NovaState, values: jnp.ndarray, base_learning_rate: float = 0.3,
+               volatility_threshold: float = 0.3) -> Tuple[NovaState, NovaOutputs]:
+    """Advance many independent users at once; state and values share a leading axis"""
+    return jax.vmap(step, in_axes=(0, 0, None, None))(
+        state, values, base_learning_rate, volatility_threshold
+    )
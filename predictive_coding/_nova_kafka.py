@@ -0,0 +1,283 @@
+"""
+Kafka plumbing shared by the NOVA proof-of-concept scripts.
+
+03_kafka_nova_poc.py and 04_kafka_nova_ollama.py differ in what their
+layers do with a message, not in how messages reach them: both use the
+librdkafka tuning, the NOVALayer base class and the timing decorator
+defined here.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Union
+
+import orjson
+from confluent_kafka import Consumer, Producer
+
+
+logger = logging.getLogger(__name__)
+
+# librdkafka tuning applied to every producer and consumer: batch and
+# compress produced messages, fetch in bulk. Explicit kafka_config entries
+# take precedence for consumers. Layer outputs are ephemeral, so producers
+# don't wait for broker acks by default; a message lost in transit is
+# dropped silently rather than reported to delivery_report.
+PRODUCER_DEFAULTS = {
+    "linger.ms": 100,
+    # Keyless messages stick to one partition per linger window, so they
+    # fill whole batches instead of being spread across partitions
+    "sticky.partitioning.linger.ms": 100,
+    "batch.size": 200000,
+    "batch.num.messages": 10000,
+    "compression.type": "lz4",
+    "queue.buffering.max.messages": 100000,
+    "acks": 0,
+    "enable.idempotence": False,
+    # Only failed deliveries call back into Python
+    "delivery.report.only.error": True,
+}
+# Delivery failures tend to arrive in bursts (every queued message fails when
+# a broker is unreachable), so they are reported as a count at most this often
+DELIVERY_ERROR_LOG_INTERVAL = 5.0  # seconds
+
+CONSUMER_DEFAULTS = {
+    "fetch.min.bytes": 1 << 16,
+    "fetch.wait.max.ms": 50,
+    "queued.min.messages": 100000,
+}
+
+
+class KafkaPublishError(Exception):
+    """Raised when there is an error publishing messages to Kafka"""
+
+    pass
+
+
+class NOVALayerError(Exception):
+    """Base exception for NOVA layer errors"""
+
+    pass
+
+
+def timed_process(func):
+    """Decorator to add timing information to layer processing"""
+
+    async def wrapper(self, message: Dict[str, Any], *args, **kwargs) -> Dict[str, Any]:
+        # Wall-clock time only stamps the start; the duration comes from the
+        # monotonic clock so clock adjustments can't make it negative
+        start_time = time.time()
+        start = time.perf_counter()
+        try:
+            result = await func(self, message, *args, **kwargs)
+            duration = time.perf_counter() - start
+            timing = {
+                "start_time": start_time,
+                "end_time": start_time + duration,
+                "processing_duration": duration,
+            }
+
+            # If result is already a dict, update it; otherwise create new dict
+            if isinstance(result, dict):
+                result.update(timing)
+                return result
+            else:
+                return {"result": result, **timing}
+        except Exception as e:
+            logger.error(
+                "Layer processing failed",
+                extra={"layer": self.name, "error": str(e)},
+                exc_info=True,
+            )
+            raise NOVALayerError(f"Layer processing failed: {e}") from e
+
+    return wrapper
+
+
+class NOVALayer:
+    """
+    Base class for NOVA processing layers.
+
+    Handles Kafka producer/consumer setup and message publishing.
+    Each layer inherits from this to implement specific processing logic.
+
+    Args:
+        kafka_config (Dict[str, Any]): Kafka configuration parameters
+        producer (Optional[Producer]): Shared producer to publish through;
+            the layer creates (and flushes on close) its own if omitted
+        fast_mode (bool): Whether the layer's own producer skips broker acks;
+            if False it waits for all in-sync replicas (acks=all)
+    """
+
+    def __init__(self, kafka_config: Dict[str, Any], producer: Optional[Producer] = None,
+                 fast_mode: bool = True):
+        self._owns_producer = producer is None
+        if producer is None:
+            # Producer config should exclude consumer-specific settings
+            producer_config = {
+                "bootstrap.servers": kafka_config["bootstrap.servers"],
+                **PRODUCER_DEFAULTS,
+            }
+            if not fast_mode:
+                producer_config["acks"] = "all"
+            producer = Producer(producer_config)
+        self.producer = producer
+        self._delivery_errors = 0
+        self._last_delivery_error: Dict[str, str] = {}
+        self._last_error_log = float("-inf")
+
+        # The consumer (its broker connections and librdkafka threads) is
+        # only created once the layer starts consuming in process_loop;
+        # layers driven directly through process() never need one
+        self.kafka_config = kafka_config
+        self.consumer: Optional[Consumer] = None
+
+    @property
+    def name(self) -> str:
+        """Identifies the layer in logs and in its consumer group id"""
+        return type(self).__name__
+
+    def close(self):
+        """
+        Properly close Kafka resources.
+        Should be called when the layer is no longer needed.
+        """
+        if self.producer and self._owns_producer:
+            self.producer.flush()  # Ensure all messages are sent
+
+        self._report_delivery_errors()
+
+        if self.consumer:
+            self.consumer.close()
+            self.consumer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def publish(self, topic: str, message: Dict[str, Any],
+                key: Optional[Union[str, bytes]] = None):
+        """
+        Non-blocking publish to Kafka topic
+
+        Messages with the same key go to the same partition, which preserves
+        their relative order (e.g. key by user or session). If the local
+        queue is full, delivery reports are served for up to a second to
+        make room before the message is given up on.
+        """
+        try:
+            value = orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY)
+            try:
+                self.producer.produce(topic, value, key=key, callback=self.delivery_report)
+            except BufferError:
+                self.producer.poll(1.0)  # Drain the queue, then retry once
+                self.producer.produce(topic, value, key=key, callback=self.delivery_report)
+            self.producer.poll(0)  # Non-blocking poll for callbacks
+        except Exception as e:
+            logger.error(
+                "Failed to publish message to Kafka",
+                extra={
+                    "topic": topic,
+                    "error": str(e),
+                    "layer": self.name,
+                },
+                exc_info=True,
+            )
+            raise KafkaPublishError(f"Failed to publish message to Kafka: {e}") from e
+
+    async def process_loop(self, input_topic: str, output_topic: str,
+                           idle_interval: float = 0.01):
+        """
+        Consume input_topic until cancelled, publishing each result to output_topic.
+
+        The consumer is polled without blocking, so all layers can share one
+        event loop; when no message is waiting the loop yields for
+        idle_interval seconds. Results keep the key of their input message.
+        A message that cannot be decoded, processed or published is logged
+        and skipped, so one bad message never stops the layer.
+        """
+        if self.consumer is None:
+            # Consumer config can keep all settings, but each layer consumes
+            # in its own group so that every layer sees every input message
+            self.consumer = Consumer(
+                {
+                    **CONSUMER_DEFAULTS,
+                    **self.kafka_config,
+                    "group.id": f"{self.kafka_config['group.id']}.{self.name}",
+                }
+            )
+        self.consumer.subscribe([input_topic])
+        while True:
+            # Report failures left over from a burst that has since stopped
+            if (self._delivery_errors and
+                    time.monotonic() - self._last_error_log >= DELIVERY_ERROR_LOG_INTERVAL):
+                self._report_delivery_errors()
+
+            msg = self.consumer.poll(0)
+            if msg is None:
+                self.producer.poll(0)  # Serve delivery reports while idle too
+                await asyncio.sleep(idle_interval)
+                continue
+            if msg.error():
+                logger.error(
+                    "Failed to consume message",
+                    extra={"error": str(msg.error()), "layer": self.name},
+                )
+                continue
+
+            value = msg.value()
+            if value is None:
+                continue  # Tombstone; nothing to process
+            try:
+                message = orjson.loads(value)
+            except orjson.JSONDecodeError as e:
+                logger.error(
+                    "Skipping message that is not valid JSON",
+                    extra={
+                        "topic": msg.topic(),
+                        "partition": msg.partition(),
+                        "offset": msg.offset(),
+                        "error": str(e),
+                        "layer": self.name,
+                    },
+                )
+                continue
+
+            try:
+                result = await self.process(message)
+                self.publish(output_topic, result, key=msg.key())
+            except (NOVALayerError, KafkaPublishError):
+                continue  # Already logged; keep consuming
+
+    def delivery_report(self, err, msg):
+        """
+        Callback for Kafka message delivery confirmation
+
+        With PRODUCER_DEFAULTS only failures are reported; successful
+        deliveries reach it only from producers configured otherwise.
+        """
+        if err is not None:
+            # Note: Can't raise here as it's a callback
+            # Consider implementing a message retry mechanism
+            self._delivery_errors += 1
+            self._last_delivery_error = {"topic": msg.topic(), "error": str(err)}
+            if time.monotonic() - self._last_error_log >= DELIVERY_ERROR_LOG_INTERVAL:
+                self._report_delivery_errors()
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Message delivered successfully",
+                extra={"topic": msg.topic(), "layer": self.name},
+            )
+
+    def _report_delivery_errors(self):
+        """Log the delivery failures counted since the last report, if any"""
+        if self._delivery_errors:
+            logger.error(
+                "Message delivery failed (%d failures since last report)",
+                self._delivery_errors,
+                extra={**self._last_delivery_error, "layer": self.name},
+            )
+            self._delivery_errors = 0
+        self._last_error_log = time.monotonic()
@@ -0,0 +1,69 @@
+"""
+Compiled kernels for the NOVA layers in 02_predcod_nova.py.
+
+Interactively the layers advance one signal at a time, and the per-call cost
+is dominated by Python bookkeeping rather than arithmetic. Replaying a
+recorded session, on the other hand, runs the same recurrence over thousands
+of values, which is exactly what Numba compiles well. As in _pc_kernel, the
+kernels run as plain Python when Numba is not installed.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from _pc_kernel import njit
+
+
+@njit(cache=True, fastmath=True)
+def reactive_run(
+    values: np.ndarray,
+    emotion: float,
+    errors: np.ndarray,
+    count: int,
+    head: int,
+    base_learning_rate: float,
+    out_emotion: np.ndarray,
+    out_err: np.ndarray,
+    out_lr: np.ndarray,
+) -> Tuple[float, int, int]:
+    """
+    Run the reactive layer's adaptive-rate emotion update over a signal.
+
+    Args:
+        values: The emotional signal value of each interaction
+        emotion: Emotional state before the first value
+        errors: Ring buffer of recent prediction errors, updated in place
+        count: Number of filled slots in `errors`
+        head: Slot of `errors` the next error is written to
+        base_learning_rate: Learning rate before volatility scaling
+        out_emotion: Receives the emotional state after each interaction
+        out_err: Receives the prediction error of each interaction
+        out_lr: Receives the learning rate used for each interaction
+
+    Returns:
+        Tuple of the final (emotion, count, head)
+    """
+    memory = errors.size
+    for t in range(values.size):
+        error = values[t] - emotion
+        errors[head] = error
+        head = (head + 1) % memory
+        if count < memory:
+            count += 1
+
+        # Population std of the filled part of the ring
+        mean = 0.0
+        for i in range(count):
+            mean += errors[i]
+        mean /= count
+        var = 0.0
+        for i in range(count):
+            var += (errors[i] - mean) ** 2
+        learning_rate = base_learning_rate * (1.0 + np.sqrt(var / count))
+
+        emotion = min(max(emotion + learning_rate * error, -1.0), 1.0)
+        out_emotion[t] = emotion
+        out_err[t] = error
+        out_lr[t] = learning_rate
+    return emotion, count, head
@@ -0,0 +1,67 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython build of the predictive coding kernels, for deployments where Numba
+is not available. _pc_kernel picks these up automatically when Numba cannot
+be imported and this extension has been compiled.
+
+The kernels accept float32 or float64 arrays (all of one type per call).
+
+Build in place with:
+
+    CFLAGS="-O3 -march=native" cythonize -i predictive_coding/_pc_kernel_cy.pyx
+"""
+
+from cython cimport floating
+from libc.math cimport fabs
+
+
+cdef inline void _step(floating *preds, const floating *lrs, double x,
+                       floating *out_err, Py_ssize_t levels) noexcept nogil:
+    cdef Py_ssize_t level
+    cdef double error
+    for level in range(levels):
+        error = x - preds[level]
+        preds[level] += lrs[level] * error
+        out_err[level] = error
+        # The error becomes the signal for the next level (error prediction)
+        x = fabs(error)
+
+
+def pc_step(floating[::1] preds, const floating[::1] lrs, double x,
+            floating[::1] out_err):
+    """
+    Propagate one input sample up the predictive coding hierarchy in place.
+
+    Args:
+        preds: Current prediction of each level, updated in place
+        lrs: Learning rate of each level
+        x: The sensory input for this timestep
+        out_err: Receives the prediction error at each level
+    """
+    with nogil:
+        _step(&preds[0], &lrs[0], x, &out_err[0], preds.shape[0])
+
+
+def pc_run(floating[::1] preds, const floating[::1] lrs, const floating[::1] signal,
+           floating[:, :] out_preds, floating[:, :] out_err):
+    """
+    Propagate a whole signal up the predictive coding hierarchy in place.
+
+    Args:
+        preds: Current prediction of each level, updated in place
+        lrs: Learning rate of each level
+        signal: The sensory input for each timestep
+        out_preds: (levels, timesteps) array receiving the updated predictions
+        out_err: (levels, timesteps) array receiving the prediction errors
+    """
+    cdef Py_ssize_t t, level, levels = preds.shape[0]
+    cdef double x, error
+    with nogil:
+        for t in range(signal.shape[0]):
+            x = signal[t]
+            for level in range(levels):
+                error = x - preds[level]
+                preds[level] += lrs[level] * error
+                out_preds[level, t] = preds[level]
+                out_err[level, t] = error
+                x = fabs(error)
@@ -1,4 +1,12 @@
+import math
+
+import numpy as np
+
+
 class LearningHistory:
+    # Keeps the coefficient of variation finite when the mean is zero
+    EPS = 1e-12
+
     def __init__(self, min_samples=5, volatility_threshold=0.3):
         """Initialize the learning history.
         
@@ -13,7 +21,44 @@ class LearningHistory:
         
         self.min_samples = min_samples
         self.volatility_threshold = volatility_threshold
-        self.history = []
+
+        # Running (Welford) statistics, so no samples need to be kept
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        """Record one interaction time.
+
+        Args:
+            value (float): The interaction time to record
+        """
+        self.count += 1
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def extend(self, values):
+        """Record many interaction times at once.
+
+        The batch statistics are computed with NumPy and merged into the
+        running ones (Chan et al.), so the result matches calling add() for
+        each value without a Python-level loop.
+
+        Args:
+            values (array_like): The interaction times to record
+        """
+        batch = np.asarray(values, dtype=np.float64).ravel()
+        if batch.size == 0:
+            return
+
+        batch_mean = float(batch.mean())
+        batch_m2 = float(np.square(batch - batch_mean).sum())
+        total = self.count + batch.size
+        delta = batch_mean - self._mean
+        self._mean += delta * batch.size / total
+        self._m2 += batch_m2 + delta * delta * self.count * batch.size / total
+        self.count = total
 
     def calculate_statistics(self):
         """Calculate mean and standard deviation of interaction times.
@@ -21,11 +66,11 @@ class LearningHistory:
         Returns:
             tuple: (mean, std_dev) if enough samples exist, else (None, None)
         """
-        if len(self.history) < self.min_samples:
+        if self.count < self.min_samples:
             return None, None
-            
-        # Rest of existing calculation code...
-        
+
+        return self._mean, math.sqrt(self._m2 / (self.count - 1))
+
     def is_stable(self):
         """Determine if interactions are stable based on volatility threshold.
         
@@ -37,5 +82,5 @@ class LearningHistory:
         if mean is None or std_dev is None:
             return False
             
-        volatility = std_dev / mean
+        volatility = std_dev / (abs(mean) + self.EPS)
         return volatility < self.volatility_threshold 
\ No newline at end of file
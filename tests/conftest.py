@@ -0,0 +1,40 @@
+"""
+Shared fixtures for the test suite.
+
+The modules under test live in predictive_coding/ and import each other as
+top-level modules (e.g. `from _pc_kernel import ...`), so that directory is
+put on sys.path. The numbered scripts are not valid module names and are
+loaded from their files instead.
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "predictive_coding"
+sys.path.insert(0, str(PACKAGE_DIR))
+os.environ.setdefault("MPLBACKEND", "Agg")  # 01_predcod imports pyplot
+
+
+def load_script(filename: str):
+    """Import one of the numbered scripts in predictive_coding/ as a module"""
+    name = "nova_" + Path(filename).stem
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, PACKAGE_DIR / filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module  # dataclasses look their module up here
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+@pytest.fixture(scope="session")
+def predcod():
+    return load_script("01_predcod.py")
+
+
+@pytest.fixture(scope="session")
+def predcod_nova():
+    return load_script("02_predcod_nova.py")
@@ -0,0 +1,29 @@
+"""Tests for utils/learning_history.py"""
+
+import numpy as np
+import pytest
+
+from utils.learning_history import LearningHistory
+
+
+def test_extend_matches_add():
+    values = np.random.default_rng(0).exponential(size=37)
+    reference = LearningHistory()
+    history = LearningHistory()
+    for value in values:
+        reference.add(value)
+
+    history.extend(values[:10])
+    history.add(values[10])
+    history.extend(values[11:])
+
+    assert history.count == reference.count
+    assert history.calculate_statistics() == pytest.approx(reference.calculate_statistics())
+    assert history.is_stable() == reference.is_stable()
+
+
+def test_is_stable_with_zero_mean():
+    history = LearningHistory()
+    history.extend([-1.0, 1.0, -1.0, 1.0, 0.0])
+
+    assert history.is_stable() is False
@@ -0,0 +1,34 @@
+"""Parity test of the JAX forward pass in _nova_jax.py against VirtualHuman"""
+
+import numpy as np
+import pytest
+
+jnp = pytest.importorskip("jax.numpy")
+nova_jax = pytest.importorskip("_nova_jax")
+
+
+def test_step_batch_matches_virtual_human(predcod_nova):
+    users, steps = 5, 40
+    # Rounded inputs keep float32 JAX results clear of the classification
+    # thresholds, where they could legitimately fall on the other side
+    values = np.round(np.random.default_rng(3).uniform(-1, 1, (users, steps)), 3)
+
+    state = nova_jax.init_batch_state(users)
+    outputs = []
+    for t in range(steps):
+        state, out = nova_jax.step_batch(state, jnp.asarray(values[:, t]))
+        outputs.append(out)
+
+    for user in range(users):
+        human = predcod_nova.VirtualHuman(simulate_latency=False)
+        for t, out in enumerate(outputs):
+            expected = human._step(float(values[user, t]))
+            for field in ("emotion", "prediction_error", "learning_rate",
+                          "predicted_next", "confidence"):
+                assert float(getattr(out, field)[user]) == pytest.approx(
+                    getattr(expected, field), abs=1e-4
+                ), (field, user, t)
+            assert int(out.state_code[user]) == expected.state_code, (user, t)
+            assert bool(out.stable[user]) == (
+                human.reflective._analyze_learning_progress()["stability"] == "stable"
+            )
@@ -0,0 +1,122 @@
+"""Parity tests for the whole-signal paths of 01_predcod.py"""
+
+import numpy as np
+import pytest
+
+LEARNING_RATES = [0.1, 0.05, 0.02]
+
+
+def make_network(predcod, capacity=1024):
+    return predcod.PredictiveCodingNetwork(
+        num_nodes=3, learning_rates=LEARNING_RATES, capacity=capacity, dtype=np.float64
+    )
+
+
+def stepwise(network, signal):
+    """Errors from feeding the signal one sample at a time, as (levels, N)"""
+    return np.array([network.process_input(x) for x in signal]).T.reshape(
+        network.num_levels, len(signal)
+    )
+
+
+@pytest.fixture
+def signal():
+    return np.random.default_rng(0).normal(size=200)
+
+
+@pytest.fixture(params=["kernel", "lfilter"])
+def backend(request, predcod, monkeypatch):
+    """Run process_batch through the compiled kernel and through lfilter"""
+    compiled = request.param == "kernel"
+    monkeypatch.setattr(predcod, "HAVE_NUMBA", compiled)
+    monkeypatch.setattr(predcod, "HAVE_CYTHON", False)
+    return request.param
+
+
+def test_process_batch_matches_process_input(predcod, signal, backend):
+    reference = make_network(predcod)
+    network = make_network(predcod)
+
+    expected = stepwise(reference, signal)
+    errors = network.process_batch(signal)
+
+    assert errors.shape == (3, signal.size)
+    np.testing.assert_allclose(errors, expected, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(network.predictions, reference.predictions, rtol=1e-10)
+    np.testing.assert_allclose(
+        network.pred_history[:, :network._n], reference.pred_history[:, :reference._n],
+        rtol=1e-10, atol=1e-12,
+    )
+
+
+def test_split_batches_continue_seamlessly(predcod, signal, backend):
+    reference = make_network(predcod)
+    network = make_network(predcod)
+    expected = stepwise(reference, signal)
+
+    # Mix batches of uneven size (including an empty one) with single steps
+    parts = [
+        network.process_batch(signal[:7]),
+        network.process_batch(signal[7:7]),
+        stepwise(network, signal[7:20]),
+        network.process_batch(signal[20:]),
+    ]
+
+    np.testing.assert_allclose(np.hstack(parts), expected, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(
+        network.err_history[:, :network._n], expected, rtol=1e-10, atol=1e-12
+    )
+
+
+def test_history_grows_past_capacity(predcod, signal, backend):
+    reference = make_network(predcod)
+    network = make_network(predcod, capacity=4)
+
+    expected = stepwise(reference, signal[:50])
+    stepwise(network, signal[:3])
+    network.process_batch(signal[3:50])
+
+    assert network.pred_history.shape[1] >= 50
+    np.testing.assert_allclose(
+        network.err_history[:, :50], expected, rtol=1e-10, atol=1e-12
+    )
+
+
+def test_run_sweep_matches_independent_networks(predcod):
+    rng = np.random.default_rng(1)
+    signals = rng.normal(size=(4, 60))
+    learning_rates = rng.uniform(0.01, 0.5, size=(4, 3))
+
+    errors = predcod.run_sweep(signals, learning_rates, dtype=np.float64)
+
+    assert errors.shape == (4, 60, 3)
+    for row in range(4):
+        network = predcod.PredictiveCodingNetwork(
+            num_nodes=3, learning_rates=learning_rates[row], dtype=np.float64
+        )
+        np.testing.assert_allclose(
+            errors[row].T, stepwise(network, signals[row]), rtol=1e-10, atol=1e-12
+        )
+
+
+def test_standalone_node_update(predcod):
+    node = predcod.PredictiveCodingNode(learning_rate=0.5)
+
+    error, prediction = node.update(1.0)
+
+    assert error == pytest.approx(1.0)
+    assert prediction == pytest.approx(0.5)
+    np.testing.assert_allclose(node.prediction_history, [0.5])
+
+
+def test_network_node_update_touches_only_its_level(predcod):
+    network = make_network(predcod)
+    network.process_input(1.0)
+    before = network.predictions.copy()
+
+    error, prediction = network.nodes[1].update(0.5)
+
+    assert error == pytest.approx(0.5 - before[1])
+    assert prediction == pytest.approx(before[1] + LEARNING_RATES[1] * error)
+    np.testing.assert_array_equal(network.predictions[[0, 2]], before[[0, 2]])
+    assert network._n == 1  # Single-level updates are not timesteps
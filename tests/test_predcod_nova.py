@@ -0,0 +1,156 @@
+"""Parity tests for the batch paths of 02_predcod_nova.py"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).uniform(-1, 1, size=120)
+
+
+def test_reactive_batch_matches_step(predcod_nova, values):
+    reference = predcod_nova.ReactiveLayer(simulate_latency=False)
+    layer = predcod_nova.ReactiveLayer(simulate_latency=False)
+    expected = np.array([reference.step(v) for v in values]).T
+
+    # Split batches with single steps in between, so state carries both ways
+    parts = [
+        np.array(layer.process_batch(values[:3])),
+        np.array([layer.step(v) for v in values[3:10]]).T,
+        np.array(layer.process_batch(values[10:])),
+    ]
+
+    np.testing.assert_allclose(np.hstack(parts), expected, rtol=1e-12, atol=1e-12)
+    assert layer.emotional_state == pytest.approx(reference.emotional_state)
+    np.testing.assert_allclose(list(layer.recent_errors), list(reference.recent_errors))
+
+
+def test_responsive_batch_matches_step(predcod_nova, values):
+    codes = predcod_nova._STATE_CODES
+    emotions = np.tanh(values)
+    reference = predcod_nova.ResponsiveLayer(simulate_latency=False)
+    layer = predcod_nova.ResponsiveLayer(simulate_latency=False)
+    steps = [reference.step(v, e) for v, e in zip(values, emotions)]
+
+    predicted, states = [], []
+    for start, stop in ((0, 2), (2, 15), (15, values.size)):
+        batch_predicted, batch_states = layer.process_batch(
+            values[start:stop], emotions[start:stop]
+        )
+        predicted.extend(batch_predicted)
+        states.extend(batch_states)
+
+    np.testing.assert_allclose(predicted, [p for p, _ in steps], rtol=1e-12)
+    assert states == [codes[s] for _, s in steps]
+    assert layer.current_state is reference.current_state
+    assert layer._context_sum == pytest.approx(reference._context_sum)
+
+
+def test_reflective_batch_wraps_ring_like_step(predcod_nova, values):
+    errors = np.diff(values, prepend=0.0)
+    timestamps = np.arange(1, values.size + 1, dtype=np.float64)
+    # A small ring so both paths wrap around it several times
+    reference = predcod_nova.ReflectiveLayer(history_size=7, simulate_latency=False)
+    layer = predcod_nova.ReflectiveLayer(history_size=7, simulate_latency=False)
+    expected = [reference.step(*args) for args in zip(values, errors, timestamps)]
+
+    confidences = np.concatenate([
+        layer.process_batch(values[:4], errors[:4], timestamps[:4]),
+        [layer.step(*args) for args in zip(values[4:9], errors[4:9], timestamps[4:9])],
+        layer.process_batch(values[9:], errors[9:], timestamps[9:]),
+    ])
+
+    np.testing.assert_allclose(confidences, expected, rtol=1e-9, atol=1e-12)
+    assert layer.history_length == reference.history_length == 7
+    assert layer._history_head == reference._history_head
+    assert layer.interaction_history == reference.interaction_history
+    assert layer._calculate_volatility() == pytest.approx(reference._calculate_volatility())
+
+
+def test_virtual_human_batch_matches_step(predcod_nova, values):
+    reference = predcod_nova.VirtualHuman(simulate_latency=False)
+    human = predcod_nova.VirtualHuman(simulate_latency=False)
+    steps = [reference._step(v) for v in values]
+
+    first = human.process_batch(values[:50])
+    second = human.process_batch(values[50:])
+
+    for field in predcod_nova._StepOut._fields:
+        batched = np.concatenate([first[field], second[field]])
+        np.testing.assert_allclose(
+            batched, [getattr(s, field) for s in steps], rtol=1e-9, atol=1e-12,
+            err_msg=field,
+        )
+    assert human.interaction_count == reference.interaction_count
+
+
+def test_step_matches_process_value(predcod_nova, values):
+    reference = predcod_nova.VirtualHuman(simulate_latency=False, seed=0)
+    human = predcod_nova.VirtualHuman(simulate_latency=False, seed=0)
+
+    async def run():
+        return [await reference.process_value(float(v)) for v in values[:20]]
+
+    results = asyncio.run(run())
+    for result, value in zip(results, values[:20]):
+        step = human._step(float(value))
+        assert step.emotion == result["reactive"]["emotion"]
+        assert step.predicted_next == result["responsive"]["predicted_next"]
+        assert step.confidence == result["reflective"]["confidence"]
+
+
+@pytest.mark.parametrize("layer_name, attribute", [
+    ("ReactiveLayer", "base_learning_rate"),
+    ("ReactiveLayer", "memory_size"),
+    ("ReflectiveLayer", "min_samples"),
+    ("ReflectiveLayer", "history_size"),
+])
+def test_step_bound_hyperparameters_are_read_only(predcod_nova, layer_name, attribute):
+    layer = getattr(predcod_nova, layer_name)(simulate_latency=False)
+
+    with pytest.raises(AttributeError):
+        setattr(layer, attribute, 2)
+
+
+@pytest.mark.skipif(not __debug__, reason="range checks are skipped under python -O")
+def test_fallback_reports_measured_time(predcod_nova):
+    human = predcod_nova.VirtualHuman(simulate_latency=False)
+
+    result = asyncio.run(human.process_value(2.0))  # Out of range
+
+    assert result["responsive"]["response"] == "Let's continue our discussion."
+    assert 0.0 <= result["total_processing_time"] < 0.05
+    assert result["reactive"]["response_time"] == 0.0
+
+
+def test_classify_engagement_batch_matches_scalar(predcod_nova):
+    # A grid that straddles every threshold in ENGAGEMENT_RULES
+    axis = np.round(np.arange(-0.9, 0.95, 0.05), 2)
+    trends, momenta, volatilities = (
+        grid.ravel() for grid in np.meshgrid(axis, axis, np.abs(axis))
+    )
+
+    codes = predcod_nova.classify_engagement_batch(trends, momenta, volatilities)
+
+    expected = [
+        predcod_nova._STATE_CODES[predcod_nova.classify_engagement(t, m, v)]
+        for t, m, v in zip(trends, momenta, volatilities)
+    ]
+    assert codes.tolist() == expected
+    assert len(set(expected)) == 6  # Every state except BUILDING_RAPPORT
+
+
+@pytest.mark.parametrize("value", [0.4, 1.5])
+def test_process_value_validates_like_process_interaction(predcod_nova, value):
+    by_value = asyncio.run(predcod_nova.VirtualHuman(seed=0).process_value(value))
+    by_signal = asyncio.run(
+        predcod_nova.VirtualHuman(seed=0).process_interaction("emotion", value)
+    )
+
+    for layer in ("reactive", "responsive"):
+        for key in ("emotion", "predicted_next", "response", "state"):
+            if key in by_signal[layer]:
+                assert by_value[layer][key] == by_signal[layer][key]